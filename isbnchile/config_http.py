@@ -9,9 +9,13 @@ BASE_URL = "https://isbnchile.cl/"
 # Output settings
 OUTPUT_DIR = "scraped_data"
 OUTPUT_FORMAT = "json"
+# Output files ending in .gz (or .zst, needs the zstandard package) are
+# written compressed; readers detect compression automatically and also
+# find an uncompressed file of the same name from older runs
 
 # HTTP Scraping settings (optimized for stable detail pages)
-REQUEST_TIMEOUT = 180  # Seconds to wait for response
+REQUEST_CONNECT_TIMEOUT = 15  # Seconds to establish the TCP/TLS connection
+REQUEST_TIMEOUT = 180  # Seconds to wait for the response once connected (read timeout)
 DELAY_BETWEEN_REQUESTS = 0  # No delay - maximum speed!
 DELAY_RANDOMIZATION = 0.5  # Small random delay to appear more human
 MAX_RETRIES = 5  # Maximum retry attempts per request
@@ -21,6 +25,10 @@ RETRY_BACKOFF_BASE = 30  # Base seconds for exponential backoff (30, 60, 120, 24
 SERVER_ERROR_WAIT_TIME = 300  # Wait 5 minutes when server returns 500/503
 SERVER_ERROR_MAX_RETRIES = 10  # Try up to 10 times for server errors (50 minutes total)
 
+# Connection pool (see http_fetch.py) - grown automatically if concurrency exceeds it
+HTTP_POOL_CONNECTIONS = 2  # Hosts to keep pools for (only isbnchile.cl is used)
+HTTP_POOL_MAXSIZE = 4  # Keep-alive connections per host
+
 # Circuit breaker settings
 CIRCUIT_BREAKER_THRESHOLD = 10  # Consecutive failures before circuit breaks
 CIRCUIT_BREAKER_COOLDOWN = 300  # Seconds to wait when circuit breaks (5 minutes)
@@ -33,8 +41,31 @@ PHASE1_CHECKPOINT_FILE = "phase1_checkpoint.json"
 
 # Phase 2 settings - Complete Metadata Extraction
 PHASE2_CHECKPOINT_INTERVAL = 50  # Save every 50 books
-PHASE2_OUTPUT_FILE = "books_complete.json"
-PHASE2_CHECKPOINT_FILE = "phase2_checkpoint.json"
+PHASE2_OUTPUT_FILE = "books_complete.json.gz"
+PHASE2_CHECKPOINT_FILE = "phase2_checkpoint.json.gz"
+PHASE2_CONCURRENCY = 1  # Parallel detail requests (1 = sequential, safest for a fragile server)
+
+# Empty ID detection - a detail page without any of these classes has no
+# title and no ISBN, so it is recorded as empty without being parsed
+DETAIL_PAGE_MARKER_PATTERN = rb"""class\s*=\s*["'][^"']*\b(?:TituloNolink|isbn)\b"""
+
+# ID scheduling - see id_scheduler.py
+PHASE2_SCHEDULE = "sequential"  # "sequential" (ID order) or "density" (dense ID ranges first)
+ID_DENSITY_FILE = "id_density.json"  # Learned share of real books per ID range, lives in OUTPUT_DIR
+ID_DENSITY_TEST_FILE = "id_density_test.json"  # Used by --test runs so they don't skew the real map
+ID_DENSITY_BUCKET_SIZE = 1000  # IDs per range
+ID_DENSITY_PROBE_SIZE = 20  # IDs sampled from each unexplored range before ranking
+
+# HTTP cache for detail pages - see http_cache.py
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_FILE = "http_cache.sqlite3"  # Lives in OUTPUT_DIR
+HTTP_CACHE_TEST_FILE = "http_cache_test.sqlite3"  # Used by --test runs
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024  # LRU eviction above this size
+
+# Live controls - see crawl_control.py
+CONTROL_FILE = "phase2_control.json"  # Polled between requests, lives in OUTPUT_DIR
+CONTROL_POLL_INTERVAL = 5  # Seconds between control file checks while paused
+CONTROL_SLEEP_STEP = 1  # Backoff/cooldown sleeps check for pause/drain this often (seconds)
 
 # URL templates
 SEARCH_RESULTS_URL = "https://isbnchile.cl/catalogo.php?mode=resultados_avanzada&pagina={page}"
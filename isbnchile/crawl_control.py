@@ -0,0 +1,187 @@
+"""
+Live crawl controls for the Phase 2 HTTP scraper
+
+Lets a multi-day run be retuned without restarting it. The scraper polls a
+JSON control file between requests and applies any changed values:
+
+    {
+        "state": "run",                   # run | pause | drain
+        "delay_between_requests": 0.5,
+        "delay_randomization": 0.5,
+        "max_retries": 5,
+        "circuit_breaker_threshold": 10,
+        "circuit_breaker_cooldown": 300,
+        "connect_timeout": 15,
+        "request_timeout": 180,
+        "concurrency": 2
+    }
+
+Only the keys present are applied, anything missing keeps its current value.
+"drain" finishes the requests in flight, saves a checkpoint and exits.
+
+Signals (POSIX only) do the same without editing the file:
+    SIGHUP  - re-read the control file now
+    SIGUSR1 - toggle pause/resume
+    SIGTERM - drain and exit
+"""
+
+import json
+import os
+import signal
+import threading
+import config_http as config
+
+STATE_RUN = 'run'
+STATE_PAUSE = 'pause'
+STATE_DRAIN = 'drain'
+VALID_STATES = (STATE_RUN, STATE_PAUSE, STATE_DRAIN)
+
+# Tunable setting -> (type, minimum value)
+SETTING_TYPES = {
+    'delay_between_requests': (float, 0),
+    'delay_randomization': (float, 0),
+    'max_retries': (int, 1),
+    'circuit_breaker_threshold': (int, 1),
+    'circuit_breaker_cooldown': (float, 0),
+    'connect_timeout': (float, 1),
+    'request_timeout': (float, 1),
+    'concurrency': (int, 1),
+}
+
+
+def default_settings():
+    """Initial settings taken from config_http"""
+    return {
+        'delay_between_requests': config.DELAY_BETWEEN_REQUESTS,
+        'delay_randomization': config.DELAY_RANDOMIZATION,
+        'max_retries': config.MAX_RETRIES,
+        'circuit_breaker_threshold': config.CIRCUIT_BREAKER_THRESHOLD,
+        'circuit_breaker_cooldown': config.CIRCUIT_BREAKER_COOLDOWN,
+        'connect_timeout': config.REQUEST_CONNECT_TIMEOUT,
+        'request_timeout': config.REQUEST_TIMEOUT,
+        'concurrency': config.PHASE2_CONCURRENCY,
+    }
+
+
+class CrawlControl:
+    def __init__(self, control_file=None):
+        self.control_file = control_file or os.path.join(config.OUTPUT_DIR, config.CONTROL_FILE)
+        self.settings = default_settings()
+        self.state = STATE_RUN
+        self.last_mtime = None
+        self.reload_requested = False
+        self.poll_lock = threading.Lock()
+
+    def start(self):
+        """Install signal handlers and load a control file prepared before the run"""
+        self.install_signal_handlers()
+        self.poll()
+
+        # A "drain" left over from the previous run would stop this one at once
+        if self.draining:
+            print(f"⚠️  {self.control_file} says \"drain\" (left from the last run?) - ignoring until it changes")
+            self.state = STATE_RUN
+
+    def install_signal_handlers(self):
+        """Register signal handlers where the platform supports them"""
+        handlers = {
+            'SIGHUP': self._on_reload_signal,
+            'SIGUSR1': self._on_pause_signal,
+            'SIGTERM': self._on_drain_signal,
+        }
+        for name, handler in handlers.items():
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), handler)
+
+    def _on_reload_signal(self, signum, frame):
+        self.reload_requested = True
+
+    def _on_pause_signal(self, signum, frame):
+        if self.state == STATE_PAUSE:
+            self.state = STATE_RUN
+        elif self.state == STATE_RUN:
+            self.state = STATE_PAUSE
+
+    def _on_drain_signal(self, signum, frame):
+        self.state = STATE_DRAIN
+
+    def poll(self):
+        """
+        Re-read the control file if it changed (or a reload was signalled)
+
+        Returns:
+            dict of settings that changed value, empty if nothing changed
+        """
+        # Worker threads poll during backoff sleeps - one reader at a time is enough
+        if not self.poll_lock.acquire(blocking=False):
+            return {}
+        try:
+            return self._poll()
+        finally:
+            self.poll_lock.release()
+
+    def _poll(self):
+        try:
+            mtime = os.path.getmtime(self.control_file)
+        except OSError:
+            return {}
+
+        if mtime == self.last_mtime and not self.reload_requested:
+            return {}
+
+        self.last_mtime = mtime
+        self.reload_requested = False
+
+        try:
+            with open(self.control_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"\n⚠️  Ignoring unreadable control file {self.control_file}: {e}")
+            return {}
+
+        if not isinstance(data, dict):
+            print(f"\n⚠️  Ignoring control file {self.control_file}: expected a JSON object")
+            return {}
+
+        return self.apply(data)
+
+    def apply(self, data):
+        """Validate and apply control values, returning the ones that changed"""
+        changed = {}
+
+        state = data.get('state')
+        if state is not None:
+            if state in VALID_STATES:
+                # Once draining, a stale "run" in the file must not undo it
+                if state != self.state and self.state != STATE_DRAIN:
+                    self.state = state
+                    changed['state'] = state
+            else:
+                print(f"\n⚠️  Ignoring unknown control state: {state!r}")
+
+        for key, (cast, minimum) in SETTING_TYPES.items():
+            if key not in data:
+                continue
+            try:
+                value = cast(data[key])
+            except (TypeError, ValueError):
+                print(f"\n⚠️  Ignoring invalid control value {key}={data[key]!r}")
+                continue
+            value = max(value, minimum)
+            if value != self.settings[key]:
+                self.settings[key] = value
+                changed[key] = value
+
+        unknown = set(data) - set(SETTING_TYPES) - {'state'}
+        if unknown:
+            print(f"\n⚠️  Ignoring unknown control keys: {sorted(unknown)}")
+
+        return changed
+
+    @property
+    def paused(self):
+        return self.state == STATE_PAUSE
+
+    @property
+    def draining(self):
+        return self.state == STATE_DRAIN
@@ -0,0 +1,216 @@
+"""
+On-disk HTTP cache for book detail pages
+
+Stores, per URL, the validators the server sent (ETag / Last-Modified) plus
+a hash of the page body and the book record parsed from it. On a refresh
+crawl the scraper sends a conditional request; a 304, or a 200 whose body
+hash matches the cached one, returns the cached record without parsing
+the page again. Every record is stamped with the version of the parser
+that produced it; entries from another version count as misses, so a
+parser change never serves stale records.
+
+Entries live in a single SQLite file (stdlib, safe to share between the
+scraper's worker threads) and are evicted least-recently-used first once
+the database goes over HTTP_CACHE_MAX_BYTES. The file uses incremental
+auto-vacuum so evicted pages are actually given back to the filesystem.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import config_http as config
+
+# After eviction the cache is trimmed to this fraction of the limit, so we
+# don't evict on every single store once the cache is full
+EVICTION_TARGET_RATIO = 0.9
+EVICTION_BATCH_SIZE = 500
+# Cap on the write-ahead log left on disk after checkpoints
+WAL_SIZE_LIMIT = 16 * 1024 * 1024
+
+
+def body_hash(content):
+    """Stable hash of a response body"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class HTTPCache:
+    def __init__(self, path=None, max_bytes=None, record_version=0):
+        self.path = path or os.path.join(config.OUTPUT_DIR, config.HTTP_CACHE_FILE)
+        self.max_bytes = max_bytes if max_bytes is not None else config.HTTP_CACHE_MAX_BYTES
+        self.record_version = record_version
+        self.lock = threading.Lock()
+        self.hits_not_modified = 0  # Server answered 304
+        self.hits_unchanged = 0     # Server sent the page again, body hash matched
+        self.misses = 0             # Not cached, or the page changed
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        if self.db.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            # Switching an existing file to incremental auto-vacuum needs a VACUUM
+            self.db.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            self.db.executescript('VACUUM;')
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(f'PRAGMA journal_size_limit={WAL_SIZE_LIMIT}')
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the entries table, upgrading cache files from older versions"""
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                record TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                record_version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        columns = [row[1] for row in self.db.execute('PRAGMA table_info(entries)')]
+        if 'record_version' not in columns:
+            # Cache files created before records were versioned
+            self.db.execute('ALTER TABLE entries ADD COLUMN record_version INTEGER NOT NULL DEFAULT 0')
+        if 'size' in columns:
+            # Per-entry size estimate, unused since eviction follows the file size
+            try:
+                self.db.execute('ALTER TABLE entries DROP COLUMN size')
+            except sqlite3.OperationalError:
+                # SQLite < 3.35 cannot drop columns - it is only a cache, start over
+                self.db.execute('DROP TABLE entries')
+                self._create_schema()
+                return
+        self.db.execute('CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)')
+
+    def lookup(self, url):
+        """Return the cached entry for a URL, or None (also for records from another parser version)"""
+        with self.lock:
+            row = self.db.execute(
+                'SELECT etag, last_modified, body_hash, record, record_version FROM entries WHERE url = ?',
+                (url,)
+            ).fetchone()
+
+        if not row or row[4] != self.record_version:
+            return None
+
+        return {
+            'url': url,
+            'etag': row[0],
+            'last_modified': row[1],
+            'body_hash': row[2],
+            'record': json.loads(row[3]),
+        }
+
+    def conditional_headers(self, entry):
+        """Request headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if not entry:
+            return headers
+
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def cached_record(self, entry, response):
+        """
+        Check whether the response shows the cached page is unchanged
+
+        Counts a hit or a miss. The record may itself be None (a page
+        cached as empty), so the hit flag is returned separately.
+
+        Returns:
+            (hit, record) - hit is False when the page must be parsed
+        """
+        if entry and response.status_code == 304:
+            with self.lock:
+                self.hits_not_modified += 1
+                self._touch(entry['url'])
+            return True, entry['record']
+
+        if entry and response.status_code == 200 and body_hash(response.content) == entry['body_hash']:
+            with self.lock:
+                self.hits_unchanged += 1
+                self._touch(entry['url'])
+            return True, entry['record']
+
+        with self.lock:
+            self.misses += 1
+        return False, None
+
+    def store(self, url, response, record):
+        """Cache the validators, body hash and parsed record (None = empty page) for a 200 response"""
+        record_json = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(url, etag, last_modified, body_hash, record, last_used, record_version) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, body_hash(response.content), record_json, time.time(),
+                 self.record_version)
+            )
+
+            if self._database_bytes() > self.max_bytes:
+                self._evict()
+
+    def _database_bytes(self):
+        """Size of the database in use, excluding free pages (lock held)"""
+        page_size = self.db.execute('PRAGMA page_size').fetchone()[0]
+        page_count = self.db.execute('PRAGMA page_count').fetchone()[0]
+        free_pages = self.db.execute('PRAGMA freelist_count').fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def _touch(self, url):
+        """Mark an entry as recently used (lock held)"""
+        self.db.execute('UPDATE entries SET last_used = ? WHERE url = ?', (time.time(), url))
+
+    def _evict(self):
+        """Drop least recently used entries until under the target size (lock held)"""
+        target = self.max_bytes * EVICTION_TARGET_RATIO
+
+        while self._database_bytes() > target:
+            rows = self.db.execute(
+                'SELECT url FROM entries ORDER BY last_used LIMIT ?',
+                (EVICTION_BATCH_SIZE,)
+            ).fetchall()
+            if not rows:
+                break
+
+            self.db.executemany('DELETE FROM entries WHERE url = ?', rows)
+            self.evictions += len(rows)
+
+        # Commits, then returns the freed pages to the filesystem. Needs
+        # executescript: execute() would only step the pragma once (one page).
+        self.db.executescript('PRAGMA incremental_vacuum;')
+
+    def commit(self):
+        """Flush pending writes (called at checkpoints)"""
+        with self.lock:
+            self.db.commit()
+
+    def close(self):
+        self.commit()
+        with self.lock:
+            self.db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self.db.close()
+
+    def stats(self):
+        """Hit/miss counters for the summary"""
+        hits = self.hits_not_modified + self.hits_unchanged
+        lookups = hits + self.misses
+        return {
+            'hits_not_modified': self.hits_not_modified,
+            'hits_unchanged': self.hits_unchanged,
+            'misses': self.misses,
+            'hit_rate': (hits / lookups * 100) if lookups else 0,
+            'evictions': self.evictions,
+            'size_bytes': os.path.getsize(self.path),
+        }
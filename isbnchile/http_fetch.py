@@ -0,0 +1,145 @@
+"""
+Pooled HTTP fetcher for book detail pages
+
+Wraps the requests.Session used by the Phase 2 scraper with:
+- an explicitly sized keep-alive connection pool (sized for the crawl's
+  concurrency, blocking instead of opening throwaway connections)
+- separate connect and read timeouts
+- recycling of all pooled connections after gateway errors, since the
+  server tends to leave dead keep-alive sockets behind after a 502/503/504
+- counters for new connections (TCP/TLS handshakes) versus reused ones
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+import config_http as config
+
+# Responses after which pooled keep-alive connections are not trusted anymore
+RECYCLE_STATUS_CODES = (502, 503, 504)
+
+
+def counting_pool_classes(on_connect):
+    """
+    urllib3 pool classes whose connections call on_connect() per handshake
+
+    Counted in connect() itself, because urllib3 reconnects the same
+    connection object when it finds a dropped keep-alive socket - counting
+    connection objects would report those handshakes as reuse.
+    """
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self):
+            super().connect()
+            on_connect()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            super().connect()
+            on_connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+
+class PooledFetcher:
+    def __init__(self, pool_maxsize=None):
+        self.session = requests.Session()
+        self.session.headers.update(config.HEADERS)
+        self.lock = threading.Lock()
+        self.pool_maxsize = 0
+        self.adapter = None
+
+        # Request counters from pools that were already recycled or replaced
+        self.retired_requests = 0
+        self.recycles = 0
+        self.handshakes = 0
+        self.handshake_lock = threading.Lock()
+        self.pool_classes = counting_pool_classes(self._count_handshake)
+
+        self.resize_pool(pool_maxsize or config.HTTP_POOL_MAXSIZE)
+
+    def resize_pool(self, pool_maxsize):
+        """Mount a new adapter whose pool holds pool_maxsize connections per host"""
+        with self.lock:
+            old_adapter = self.adapter
+            self.adapter = HTTPAdapter(
+                pool_connections=config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=pool_maxsize,
+                pool_block=True,
+                max_retries=0,  # Retries are handled by the scraper's backoff
+            )
+            self.adapter.poolmanager.pool_classes_by_scheme = self.pool_classes
+            self.session.mount('https://', self.adapter)
+            self.session.mount('http://', self.adapter)
+            self.pool_maxsize = pool_maxsize
+
+            if old_adapter:
+                self._retire(old_adapter)
+                old_adapter.close()
+
+    def ensure_pool_size(self, concurrency):
+        """Grow the pool if the crawl now runs more requests in parallel"""
+        if concurrency > self.pool_maxsize:
+            self.resize_pool(concurrency)
+
+    def get(self, url, connect_timeout, read_timeout, headers=None):
+        """GET a URL, recycling pooled connections after gateway/connection errors"""
+        try:
+            response = self.session.get(url, timeout=(connect_timeout, read_timeout), headers=headers)
+        except (requests.ConnectionError, requests.Timeout):
+            self.recycle()
+            raise
+
+        if response.status_code in RECYCLE_STATUS_CODES:
+            self.recycle()
+        return response
+
+    def recycle(self):
+        """Close every pooled connection so the next requests start clean"""
+        with self.lock:
+            self._retire(self.adapter)
+            self.adapter.poolmanager.clear()
+            self.recycles += 1
+
+    def _pools(self, adapter):
+        """Connection pools currently held by an adapter"""
+        pools = adapter.poolmanager.pools
+        found = []
+        for key in pools.keys():
+            try:
+                found.append(pools[key])
+            except KeyError:  # Evicted between keys() and lookup
+                pass
+        return found
+
+    def _count_handshake(self):
+        with self.handshake_lock:
+            self.handshakes += 1
+
+    def _retire(self, adapter):
+        """Keep the request counters of pools that are about to be closed (lock held)"""
+        for pool in self._pools(adapter):
+            self.retired_requests += pool.num_requests
+
+    def stats(self):
+        """Connection reuse counters for the summary"""
+        with self.lock:
+            pools = self._pools(self.adapter)
+            total_requests = self.retired_requests + sum(pool.num_requests for pool in pools)
+        new_connections = self.handshakes
+
+        reused = max(total_requests - new_connections, 0)
+        return {
+            'requests': total_requests,
+            'new_connections': new_connections,
+            'reused_connections': reused,
+            'reuse_rate': (reused / total_requests * 100) if total_requests else 0,
+            'recycles': self.recycles,
+        }
@@ -0,0 +1,140 @@
+"""
+Book ID scheduling for the Phase 2 HTTP scraper
+
+Many nt IDs in the catalogue range are empty (the page has no title or
+ISBN). Valid IDs are not spread evenly: some stretches of the range are
+almost all real books, others almost all gaps. The density scheduler
+splits the range into fixed-size buckets, samples each bucket a little to
+estimate its share of real books, then works through the densest buckets
+first, re-ranking as results come in. Under a time budget this collects
+the most real books per request.
+
+The learned densities are saved to ID_DENSITY_FILE so later runs (e.g. a
+refresh crawl) start from what previous runs saw.
+"""
+
+import os
+import config_http as config
+import utils
+
+OUTCOME_BOOK = 'book'
+OUTCOME_EMPTY = 'empty'
+OUTCOME_FAILED = 'failed'
+
+# Bucket for IDs that are not plain integers
+NON_NUMERIC_BUCKET = -1
+
+
+class DensityScheduler:
+    """Hands out IDs from the buckets with the highest share of real books first"""
+
+    def __init__(self, book_ids, bucket_size=None, probe_size=None, density_file=None):
+        self.bucket_size = bucket_size or config.ID_DENSITY_BUCKET_SIZE
+        self.probe_size = probe_size if probe_size is not None else config.ID_DENSITY_PROBE_SIZE
+        self.density_file = density_file or config.ID_DENSITY_FILE
+        self.density_path = os.path.join(config.OUTPUT_DIR, self.density_file)
+        self.pending = {}  # bucket -> list of pending IDs (original order)
+        self.counts = {}   # bucket -> [valid, empty]
+        self.load_density()
+
+        for book_id in book_ids:
+            self.pending.setdefault(self.bucket_of(book_id), []).append(book_id)
+
+    def bucket_of(self, book_id):
+        try:
+            return int(book_id) // self.bucket_size
+        except (TypeError, ValueError):
+            return NON_NUMERIC_BUCKET
+
+    def density(self, bucket):
+        """Estimated share of real books in a bucket (Laplace-smoothed)"""
+        valid, empty = self.counts.get(bucket, (0, 0))
+        return (valid + 1) / (valid + empty + 2)
+
+    def observed(self, bucket):
+        valid, empty = self.counts.get(bucket, (0, 0))
+        return valid + empty
+
+    def next_batch(self, size):
+        """
+        Next IDs to fetch
+
+        Buckets seen fewer than probe_size times are sampled first, spread
+        evenly across the bucket; after that the densest bucket wins.
+        """
+        candidates = [bucket for bucket, ids in self.pending.items() if ids]
+        if not candidates:
+            return []
+
+        unprobed = [bucket for bucket in candidates if self.observed(bucket) < self.probe_size]
+        if unprobed:
+            bucket = min(unprobed, key=lambda b: (self.observed(b), b))
+            needed = self.probe_size - self.observed(bucket)
+            return self._take_spread(bucket, min(size, needed))
+
+        bucket = max(candidates, key=lambda b: (self.density(b), -b))
+        ids = self.pending[bucket]
+        batch, self.pending[bucket] = ids[:size], ids[size:]
+        return batch
+
+    def _take_spread(self, bucket, count):
+        """Take count IDs spread evenly across a bucket's pending IDs"""
+        ids = self.pending[bucket]
+        count = min(count, len(ids))
+        step = len(ids) / count
+        positions = sorted({int(i * step) for i in range(count)})
+        batch = [ids[p] for p in positions]
+        taken = set(positions)
+        self.pending[bucket] = [book_id for p, book_id in enumerate(ids) if p not in taken]
+        return batch
+
+    def record(self, book_id, outcome):
+        """Update the bucket's density with a fetch outcome (failures carry no signal)"""
+        if outcome == OUTCOME_FAILED:
+            return
+
+        counts = self.counts.setdefault(self.bucket_of(book_id), [0, 0])
+        if outcome == OUTCOME_BOOK:
+            counts[0] += 1
+        else:
+            counts[1] += 1
+
+    def remaining(self):
+        return sum(len(ids) for ids in self.pending.values())
+
+    def load_density(self):
+        """Start from the densities saved by earlier runs, if compatible"""
+        data = utils.read_json_file(self.density_path)
+        if not data or data.get('bucket_size') != self.bucket_size:
+            return
+
+        for bucket, counts in data.get('buckets', {}).items():
+            self.counts[int(bucket)] = list(counts)
+        print(f"✓ Loaded ID density for {len(self.counts)} buckets")
+
+    def save_density(self):
+        """Write the density map (quietly - it is saved alongside every checkpoint)"""
+        data = {
+            'bucket_size': self.bucket_size,
+            'buckets': {str(bucket): counts for bucket, counts in sorted(self.counts.items())},
+            'timestamp': utils.get_timestamp()
+        }
+        os.makedirs(os.path.dirname(self.density_path) or '.', exist_ok=True)
+        utils.write_json_file(data, self.density_path)
+
+
+class SequentialScheduler(DensityScheduler):
+    """Hands out IDs in their original order (still learns the density map)"""
+
+    def __init__(self, book_ids, bucket_size=None, density_file=None):
+        super().__init__([], bucket_size=bucket_size, probe_size=0, density_file=density_file)
+        self.ordered = list(book_ids)
+        self.position = 0
+
+    def next_batch(self, size):
+        batch = self.ordered[self.position:self.position + size]
+        self.position += len(batch)
+        return batch
+
+    def remaining(self):
+        return len(self.ordered) - self.position
@@ -0,0 +1,154 @@
+"""
+Compressed, streamed JSON reading and writing
+
+Kept free of scraper configuration so standalone scripts such as
+merge_files.py can use it.
+"""
+
+import gzip
+import inspect
+import json
+import os
+
+try:
+    import zstandard as zstd
+except ImportError:  # Optional - only needed for .zst output
+    zstd = None
+
+
+# Compression is chosen from the output file extension
+GZIP_EXTENSION = '.gz'
+ZSTD_EXTENSION = '.zst'
+GZIP_COMPRESSLEVEL = 6  # Level 9 is much slower for a few % smaller files
+ZSTD_LEVEL = 3
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _require_zstd():
+    """Return the zstandard module or fail with an install hint"""
+    if zstd is None:
+        raise RuntimeError("zstandard is not installed (pip install zstandard) - needed for .zst files")
+    return zstd
+
+
+def _strip_compression_ext(filepath):
+    """Remove a trailing .gz/.zst extension from a path"""
+    for ext in (GZIP_EXTENSION, ZSTD_EXTENSION):
+        if filepath.endswith(ext):
+            return filepath[:-len(ext)]
+    return filepath
+
+
+def resolve_existing_path(filepath):
+    """
+    Find the file on disk, accepting compressed/uncompressed siblings
+
+    The exact path is used when it exists. Otherwise asking for
+    'books.json' finds 'books.json.gz' and vice versa, so runs started
+    before compression was enabled can still be resumed. When several
+    siblings exist the newest wins (compressed on a tie).
+    """
+    if os.path.exists(filepath):
+        return filepath
+    
+    base = _strip_compression_ext(filepath)
+    # Ordered from most to least preferred on equal modification times
+    candidates = [base + ZSTD_EXTENSION, base + GZIP_EXTENSION, base]
+    existing = [candidate for candidate in candidates if os.path.exists(candidate)]
+    
+    if not existing:
+        return None
+    
+    # max() keeps the first candidate among equal mtimes
+    return max(existing, key=os.path.getmtime)
+
+
+def open_json_read(filepath):
+    """Open a JSON file for text reading, detecting gzip/zstd by magic bytes"""
+    with open(filepath, 'rb') as f:
+        magic = f.read(4)
+    
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(filepath, 'rt', encoding='utf-8')
+    if magic.startswith(ZSTD_MAGIC):
+        return _require_zstd().open(filepath, 'rt', encoding='utf-8')
+    return open(filepath, 'r', encoding='utf-8')
+
+
+def open_json_write(filepath, target_path=None):
+    """
+    Open a JSON file for text writing, compressing by extension
+    
+    target_path picks the compression when writing to a temporary file
+    that will later be renamed (defaults to filepath itself).
+    """
+    target_path = target_path or filepath
+    
+    if target_path.endswith(GZIP_EXTENSION):
+        return gzip.open(filepath, 'wt', encoding='utf-8', compresslevel=GZIP_COMPRESSLEVEL)
+    if target_path.endswith(ZSTD_EXTENSION):
+        module = _require_zstd()
+        return module.open(filepath, 'wt', encoding='utf-8',
+                           cctx=module.ZstdCompressor(level=ZSTD_LEVEL))
+    return open(filepath, 'w', encoding='utf-8')
+
+
+def _is_record_stream(value):
+    """True for values that should be written one record at a time"""
+    return isinstance(value, (list, tuple)) or inspect.isgenerator(value)
+
+
+def write_json_file(data, filepath):
+    """
+    Stream data to a (possibly compressed) JSON file
+    
+    Top-level lists (e.g. 'books') are encoded record by record in compact
+    form instead of building one indented string for the whole document.
+    The file is written to a temporary path and renamed into place, so an
+    interrupted write never leaves a truncated checkpoint behind.
+    """
+    tmp_path = filepath + '.tmp'
+    
+    with open_json_write(tmp_path, target_path=filepath) as f:
+        if isinstance(data, dict):
+            f.write('{')
+            for key_index, (key, value) in enumerate(data.items()):
+                if key_index > 0:
+                    f.write(',\n')
+                f.write(json.dumps(str(key), ensure_ascii=False))
+                f.write(':')
+                _write_value(f, value)
+            f.write('}\n')
+        else:
+            _write_value(f, data)
+            f.write('\n')
+    
+    os.replace(tmp_path, filepath)
+
+
+def _write_value(f, value):
+    """Write a single JSON value, streaming it if it is a record list"""
+    if not _is_record_stream(value):
+        f.write(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+        return
+    
+    f.write('[')
+    for record_index, record in enumerate(value):
+        if record_index > 0:
+            f.write(',')
+        f.write('\n')
+        f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+    f.write(']')
+
+
+def read_json_file(filepath):
+    """Load a (possibly compressed) JSON file, or None if it does not exist"""
+    existing = resolve_existing_path(filepath)
+    
+    if not existing:
+        return None
+    
+    with open_json_read(existing) as f:
+        return json.load(f)
@@ -3,8 +3,10 @@
 Merge books_partial_0.json and books_complete.json into final database
 """
 
-import json
+import os
 from datetime import datetime
+import config_http
+import json_io
 
 print("=" * 60)
 print("MERGING SCRAPED DATA FILES")
@@ -12,16 +14,15 @@ print("=" * 60)
 
 # Load partial file (books 1-81,600)
 print("\n📖 Loading books_partial_0.json...")
-with open('scraped_data/books_partial_0.json', 'r') as f:
-    partial_data = json.load(f)
+partial_data = json_io.read_json_file('scraped_data/books_partial_0.json')
 
 partial_books = partial_data.get('books', [])
 print(f"   ✓ Loaded {len(partial_books)} books (IDs 1-81,600)")
 
 # Load complete file (books 81,601-180,000)
-print("\n📖 Loading books_complete.json...")
-with open('scraped_data/books_complete.json', 'r') as f:
-    complete_data = json.load(f)
+complete_file = os.path.join(config_http.OUTPUT_DIR, config_http.PHASE2_OUTPUT_FILE)
+print(f"\n📖 Loading {complete_file}...")
+complete_data = json_io.read_json_file(complete_file)
 
 complete_books = complete_data.get('books', [])
 print(f"   ✓ Loaded {len(complete_books)} books (IDs 81,601-180,000)")
@@ -31,6 +32,11 @@ print("\n🔗 Merging books...")
 all_books = partial_books + complete_books
 print(f"   ✓ Total books: {len(all_books)}")
 
+# IDs the scraper classified as empty (no title/ISBN) are listed, not stored as books.
+# Older files still contain empty pages as books, hence books_with_data.
+empty_ids = partial_data.get('empty_ids', []) + complete_data.get('empty_ids', [])
+print(f"   ✓ Empty IDs: {len(empty_ids)}")
+
 # Calculate statistics
 books_with_data = [b for b in all_books if b.get('isbn') or b.get('title')]
 books_with_real_covers = [b for b in all_books if b.get('has_real_cover')]
@@ -40,16 +46,18 @@ final_data = {
     'total_books': len(all_books),
     'books_with_data': len(books_with_data),
     'books_with_real_covers': len(books_with_real_covers),
+    'empty_ids_count': len(empty_ids),
     'books': all_books,
+    'empty_ids': empty_ids,
     'merged_at': datetime.now().isoformat(),
-    'source_files': ['books_partial_0.json', 'books_complete.json']
+    'source_files': ['books_partial_0.json', config_http.PHASE2_OUTPUT_FILE]
 }
 
 # Save merged file
-output_file = 'scraped_data/isbn_chile_complete.json'
+# Compressed, streamed record by record (see json_io.write_json_file)
+output_file = 'scraped_data/isbn_chile_complete.json.gz'
 print(f"\n💾 Saving to {output_file}...")
-with open(output_file, 'w') as f:
-    json.dump(final_data, f, indent=2)
+json_io.write_json_file(final_data, output_file)
 
 print(f"   ✓ Saved!")
 
@@ -3,28 +3,61 @@ Phase 2 HTTP: Complete Metadata Extraction (Lightweight)
 Uses requests + BeautifulSoup for fragile servers
 """
 
-import requests
 from bs4 import BeautifulSoup
 import argparse
+import os
+import re
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import config_http as config
+import crawl_control
+import http_cache
+import http_fetch
+import id_scheduler
 import utils
 
+# Returned for IDs whose page exists but holds no book (no title, no ISBN)
+EMPTY_PAGE = 'empty'
+# Bump whenever parse_book_page changes, so cached records from the old
+# parser are fetched and parsed again instead of being reused
+PARSER_VERSION = 2
+
+# Returned when a drain stopped the retries - the ID is left pending for the next run
+INTERRUPTED = 'interrupted'
+
+DETAIL_PAGE_MARKER_RE = re.compile(config.DETAIL_PAGE_MARKER_PATTERN)
+
 
 class Phase2HTTPScraper:
-    def __init__(self, test_mode=False, test_limit=10):
+    def __init__(self, test_mode=False, test_limit=10, use_cache=config.HTTP_CACHE_ENABLED,
+                 schedule=config.PHASE2_SCHEDULE, time_budget=None):
         self.test_mode = test_mode
         self.test_limit = test_limit
+        self.schedule = schedule
+        self.time_budget = time_budget  # Seconds, None = run until done
         self.books = []
         self.book_ids = []
-        self.start_index = 0
+        self.pending_ids = []
         self.start_time = None
         self.failed_ids = []
+        self.empty_ids = []
+        self.scheduler = None
         self.consecutive_failures = 0
-        self.session = requests.Session()
-        self.session.headers.update(config.HEADERS)
+        self.failure_lock = threading.Lock()
+        self.control = crawl_control.CrawlControl()
+        self.settings = self.control.settings
+        self.fetcher = http_fetch.PooledFetcher(pool_maxsize=max(config.HTTP_POOL_MAXSIZE, self.settings['concurrency']))
+        self.session = self.fetcher.session
+        # Test runs keep their own cache and density map, like books_complete_test
+        cache_file = config.HTTP_CACHE_TEST_FILE if test_mode else config.HTTP_CACHE_FILE
+        self.density_file = config.ID_DENSITY_TEST_FILE if test_mode else config.ID_DENSITY_FILE
+        self.cache = http_cache.HTTPCache(
+            path=os.path.join(config.OUTPUT_DIR, cache_file),
+            record_version=PARSER_VERSION
+        ) if use_cache else None
         
     def load_book_ids(self):
         """Load book IDs from Phase 1 output"""
@@ -48,47 +81,105 @@ class Phase2HTTPScraper:
         return True
     
     def load_checkpoint(self):
-        """Load checkpoint if exists"""
+        """Load checkpoint if exists and work out which IDs are still pending"""
         checkpoint = utils.load_checkpoint(config.PHASE2_CHECKPOINT_FILE)
+        done = set()
         if checkpoint:
             self.books = checkpoint.get('books', [])
-            self.start_index = checkpoint.get('last_index', -1) + 1
             self.failed_ids = checkpoint.get('failed_ids', [])
-            print(f"✓ Resuming from index {self.start_index} with {len(self.books)} books already scraped")
+            self.empty_ids = checkpoint.get('empty_ids', [])
+            done.update(book['book_id'] for book in self.books)
+            done.update(self.failed_ids)
+            done.update(self.empty_ids)
+            # Older checkpoints only recorded how far the sequential scan got
+            done.update(self.book_ids[:checkpoint.get('last_index', -1) + 1])
+            print(f"✓ Resuming with {len(self.books)} books and {len(self.empty_ids)} empty IDs already scraped")
         else:
             print("✓ Starting fresh scrape")
+        
+        self.pending_ids = [book_id for book_id in self.book_ids if book_id not in done]
     
-    def save_checkpoint(self, current_index):
+    def save_checkpoint(self):
         """Save checkpoint"""
         checkpoint_data = {
             'books': self.books,
-            'last_index': current_index,
+            'schedule': self.schedule,
             'total_scraped': len(self.books),
+            'total_empty': len(self.empty_ids),
             'failed_ids': self.failed_ids,
+            'empty_ids': self.empty_ids,
             'timestamp': utils.get_timestamp()
         }
         utils.save_checkpoint(checkpoint_data, config.PHASE2_CHECKPOINT_FILE)
+        self.scheduler.save_density()
+        if self.cache:
+            self.cache.commit()
     
     def wait_with_backoff(self, attempt=0):
         """Wait with exponential backoff"""
         if attempt == 0:
-            delay = config.DELAY_BETWEEN_REQUESTS
-            delay += random.uniform(0, config.DELAY_RANDOMIZATION)
+            delay = self.settings['delay_between_requests']
+            delay += random.uniform(0, self.settings['delay_randomization'])
         else:
             delay = config.RETRY_BACKOFF_BASE * (2 ** (attempt - 1))
         
-        time.sleep(delay)
+        self.interruptible_sleep(delay)
+    
+    def interruptible_sleep(self, seconds):
+        """
+        Sleep in short steps so pause/drain take effect during long waits
+        
+        Returns early when draining, and keeps waiting past the delay while
+        paused. Returns False if the crawl is draining.
+        """
+        deadline = time.time() + seconds
+        while True:
+            self.poll_controls()
+            if self.control.draining:
+                return False
+            remaining = deadline - time.time()
+            if remaining <= 0 and not self.control.paused:
+                return True
+            time.sleep(min(config.CONTROL_SLEEP_STEP, remaining) if remaining > 0 else config.CONTROL_SLEEP_STEP)
     
     def circuit_breaker_check(self):
         """Check if circuit breaker should activate"""
-        if self.consecutive_failures >= config.CIRCUIT_BREAKER_THRESHOLD:
+        if self.consecutive_failures >= self.settings['circuit_breaker_threshold']:
+            cooldown = self.settings['circuit_breaker_cooldown']
             print(f"\n⚠️  CIRCUIT BREAKER ACTIVATED")
             print(f"   {self.consecutive_failures} consecutive failures detected")
-            print(f"   Cooling down for {config.CIRCUIT_BREAKER_COOLDOWN}s ({config.CIRCUIT_BREAKER_COOLDOWN//60} minutes)...")
-            time.sleep(config.CIRCUIT_BREAKER_COOLDOWN)
+            print(f"   Cooling down for {cooldown}s ({cooldown//60:.0f} minutes)...")
+            if not self.interruptible_sleep(cooldown):
+                return
             self.consecutive_failures = 0
             print(f"✓ Circuit breaker reset, resuming scraping")
     
+    def poll_controls(self):
+        """Apply live control changes from the control file"""
+        changed = self.control.poll()
+        if changed:
+            print(f"\n🎛️  Control update: {changed}")
+    
+    def check_controls(self):
+        """Apply live control changes and block while paused"""
+        self.poll_controls()
+        
+        if self.control.paused:
+            print(f"\n⏸️  Paused - set \"state\": \"run\" in {self.control.control_file} (or send SIGUSR1) to resume")
+            while self.control.paused:
+                time.sleep(config.CONTROL_POLL_INTERVAL)
+                self.poll_controls()
+            if not self.control.draining:
+                print("▶️  Resumed")
+    
+    def fetch_batch(self, batch_ids):
+        """Fetch a batch of books, in parallel when concurrency > 1"""
+        if len(batch_ids) == 1:
+            return [self.extract_book_metadata(batch_ids[0])]
+        
+        with ThreadPoolExecutor(max_workers=len(batch_ids)) as executor:
+            return list(executor.map(self.extract_book_metadata, batch_ids))
+    
     def extract_field_value(self, soup, label_text):
         """Extract field value by finding the label span and getting the next element's text"""
         try:
@@ -113,97 +204,146 @@ class Phase2HTTPScraper:
         except:
             return None
     
+    def is_empty_page(self, content):
+        """Cheap check for pages without a title or ISBN element, before parsing"""
+        return DETAIL_PAGE_MARKER_RE.search(content) is None
+    
+    def is_empty_record(self, book):
+        """A record without title and ISBN is not a real book"""
+        return not book or (not book.get('title') and not book.get('isbn'))
+    
+    def parse_book_page(self, book_id, url, content):
+        """Parse a book detail page into a book record, or EMPTY_PAGE"""
+        if self.is_empty_page(content):
+            return EMPTY_PAGE
+        
+        # Parse HTML
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Create book record
+        book = utils.create_empty_book_record()
+        book['book_id'] = book_id
+        book['source_url'] = url
+        book['scraped_at'] = utils.get_timestamp()
+        
+        # Extract cover URL
+        cover_img = soup.select_one('.lista_libros img')
+        if cover_img and cover_img.get('src'):
+            cover_url = cover_img['src']
+            # Convert relative URL to absolute
+            if cover_url.startswith('./'):
+                cover_url = cover_url.replace('./', 'https://isbnchile.cl/')
+            elif not cover_url.startswith('http'):
+                cover_url = 'https://isbnchile.cl/' + cover_url
+        
+            book['cover_url'] = cover_url
+            book['has_real_cover'] = not utils.is_placeholder_cover(cover_url)
+        else:
+            book['cover_url'] = config.PLACEHOLDER_COVER_URL
+            book['has_real_cover'] = False
+        
+        # Extract title from TituloNolink span
+        title_span = soup.find('span', class_='TituloNolink')
+        if title_span:
+            # Get all text, removing the subtitle (in <i> tag)
+            title_text = title_span.get_text(separator=' ', strip=True)
+            # Check for subtitle in <i> tag
+            subtitle_tag = title_span.find('i')
+            if subtitle_tag:
+                subtitle_text = subtitle_tag.get_text(strip=True)
+                book['subtitle'] = subtitle_text
+                # Remove subtitle from title
+                title_text = title_text.replace(subtitle_text, '').strip()
+            book['title'] = title_text
+        
+        # Extract ISBN from span with class 'isbn'
+        isbn_span = soup.find('span', class_='isbn')
+        if isbn_span:
+            isbn_text = isbn_span.get_text(strip=True)
+            # Remove "ISBN" label
+            book['isbn'] = isbn_text.replace('ISBN', '').strip()
+        
+        # Extract other metadata fields using the new method
+        book['author'] = self.extract_field_value(soup, 'Autor:')
+        book['publisher'] = self.extract_field_value(soup, 'Editorial:')
+        book['subject'] = self.extract_field_value(soup, 'Materia:')
+        book['target_audience'] = self.extract_field_value(soup, 'Público objetivo:')
+        book['publication_date'] = self.extract_field_value(soup, 'Publicado:')
+        book['edition_number'] = self.extract_field_value(soup, 'Número de edición:')
+        book['page_count'] = self.extract_field_value(soup, 'Número de páginas:')
+        book['size'] = self.extract_field_value(soup, 'Tamaño:')
+        book['price'] = self.extract_field_value(soup, 'Precio:')
+        book['binding'] = self.extract_field_value(soup, 'Encuadernación:')
+        book['format'] = self.extract_field_value(soup, 'Soporte:')
+        book['language'] = self.extract_field_value(soup, 'Idioma:')
+        
+        # Markers present but nothing in them - still not a real book
+        if self.is_empty_record(book):
+            return EMPTY_PAGE
+        
+        return book
+    
     def extract_book_metadata(self, book_id):
-        """Extract complete metadata from a book detail page"""
+        """
+        Extract complete metadata from a book detail page
+        
+        Returns the book record, EMPTY_PAGE for IDs without a book,
+        INTERRUPTED if a drain stopped the retries, or None if every attempt
+        failed.
+        """
         url = config.BOOK_DETAIL_URL.format(book_id=book_id)
         
-        for attempt in range(config.MAX_RETRIES):
+        max_retries = self.settings['max_retries']
+        
+        for attempt in range(max_retries):
             try:
-                # Make HTTP request
-                response = self.session.get(url, timeout=config.REQUEST_TIMEOUT)
+                # Make HTTP request (conditional if we have a cached copy)
+                entry = self.cache.lookup(url) if self.cache else None
+                headers = self.cache.conditional_headers(entry) if self.cache else None
+                response = self.fetcher.get(
+                    url,
+                    connect_timeout=self.settings['connect_timeout'],
+                    read_timeout=self.settings['request_timeout'],
+                    headers=headers
+                )
                 
                 # Check for server errors
                 if response.status_code == 504:
                     raise Exception("504 Gateway Time-out")
                 elif response.status_code == 503:
                     raise Exception("503 Service Unavailable")
-                elif response.status_code != 200:
+                elif response.status_code != 200 and not (entry and response.status_code == 304):
                     raise Exception(f"HTTP {response.status_code}")
                 
-                # Parse HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Create book record
-                book = utils.create_empty_book_record()
-                book['book_id'] = book_id
-                book['source_url'] = url
-                book['scraped_at'] = utils.get_timestamp()
-                
-                # Extract cover URL
-                cover_img = soup.select_one('.lista_libros img')
-                if cover_img and cover_img.get('src'):
-                    cover_url = cover_img['src']
-                    # Convert relative URL to absolute
-                    if cover_url.startswith('./'):
-                        cover_url = cover_url.replace('./', 'https://isbnchile.cl/')
-                    elif not cover_url.startswith('http'):
-                        cover_url = 'https://isbnchile.cl/' + cover_url
-                    
-                    book['cover_url'] = cover_url
-                    book['has_real_cover'] = not utils.is_placeholder_cover(cover_url)
+                # A cached record is reused when the page is unchanged (304 or same body)
+                hit, book = self.cache.cached_record(entry, response) if self.cache else (False, None)
+                if hit:
+                    # Same check as after parsing, in case the record predates it
+                    book = EMPTY_PAGE if self.is_empty_record(book) else dict(book, scraped_at=utils.get_timestamp())
                 else:
-                    book['cover_url'] = config.PLACEHOLDER_COVER_URL
-                    book['has_real_cover'] = False
-                
-                # Extract title from TituloNolink span
-                title_span = soup.find('span', class_='TituloNolink')
-                if title_span:
-                    # Get all text, removing the subtitle (in <i> tag)
-                    title_text = title_span.get_text(separator=' ', strip=True)
-                    # Check for subtitle in <i> tag
-                    subtitle_tag = title_span.find('i')
-                    if subtitle_tag:
-                        subtitle_text = subtitle_tag.get_text(strip=True)
-                        book['subtitle'] = subtitle_text
-                        # Remove subtitle from title
-                        title_text = title_text.replace(subtitle_text, '').strip()
-                    book['title'] = title_text
-                
-                # Extract ISBN from span with class 'isbn'
-                isbn_span = soup.find('span', class_='isbn')
-                if isbn_span:
-                    isbn_text = isbn_span.get_text(strip=True)
-                    # Remove "ISBN" label
-                    book['isbn'] = isbn_text.replace('ISBN', '').strip()
-                
-                # Extract other metadata fields using the new method
-                book['author'] = self.extract_field_value(soup, 'Autor:')
-                book['publisher'] = self.extract_field_value(soup, 'Editorial:')
-                book['subject'] = self.extract_field_value(soup, 'Materia:')
-                book['target_audience'] = self.extract_field_value(soup, 'Público objetivo:')
-                book['publication_date'] = self.extract_field_value(soup, 'Publicado:')
-                book['edition_number'] = self.extract_field_value(soup, 'Número de edición:')
-                book['page_count'] = self.extract_field_value(soup, 'Número de páginas:')
-                book['size'] = self.extract_field_value(soup, 'Tamaño:')
-                book['price'] = self.extract_field_value(soup, 'Precio:')
-                book['binding'] = self.extract_field_value(soup, 'Encuadernación:')
-                book['format'] = self.extract_field_value(soup, 'Soporte:')
-                book['language'] = self.extract_field_value(soup, 'Idioma:')
+                    book = self.parse_book_page(book_id, url, response.content)
+                    if self.cache:
+                        self.cache.store(url, response, None if book is EMPTY_PAGE else book)
                 
                 # Success - reset failure counter
-                self.consecutive_failures = 0
+                with self.failure_lock:
+                    self.consecutive_failures = 0
                 return book
                 
             except Exception as e:
-                self.consecutive_failures += 1
+                with self.failure_lock:
+                    self.consecutive_failures += 1
                 
-                if attempt < config.MAX_RETRIES - 1:
+                if attempt < max_retries - 1:
                     wait_time = config.RETRY_BACKOFF_BASE * (2 ** attempt)
-                    print(f"\n⚠️  Error on book {book_id} (attempt {attempt + 1}/{config.MAX_RETRIES}): {e}")
+                    print(f"\n⚠️  Error on book {book_id} (attempt {attempt + 1}/{max_retries}): {e}")
                     print(f"   Retrying in {wait_time}s...")
                     self.wait_with_backoff(attempt + 1)
+                    if self.control.draining:
+                        print(f"   Draining - leaving book {book_id} for the next run")
+                        return INTERRUPTED
                 else:
-                    print(f"\n✗ Failed book {book_id} after {config.MAX_RETRIES} attempts: {e}")
+                    print(f"\n✗ Failed book {book_id} after {max_retries} attempts: {e}")
                     return None
         
         return None
@@ -218,77 +358,135 @@ class Phase2HTTPScraper:
         if not self.load_book_ids():
             return
         
+        # Pick up a control file prepared before this run
+        self.control.start()
+        
         print(f"⚙️  Settings:")
-        print(f"   - Delay: {config.DELAY_BETWEEN_REQUESTS}s + random 0-{config.DELAY_RANDOMIZATION}s")
-        print(f"   - Max retries: {config.MAX_RETRIES}")
+        print(f"   - Delay: {self.settings['delay_between_requests']}s + random 0-{self.settings['delay_randomization']}s")
+        print(f"   - Concurrency: {self.settings['concurrency']}")
+        print(f"   - Timeouts: {self.settings['connect_timeout']}s connect / {self.settings['request_timeout']}s read")
+        print(f"   - Connection pool: {self.fetcher.pool_maxsize} keep-alive connections")
+        print(f"   - Max retries: {self.settings['max_retries']}")
         print(f"   - Backoff: {config.RETRY_BACKOFF_BASE}s base (exponential)")
-        print(f"   - Circuit breaker: {config.CIRCUIT_BREAKER_THRESHOLD} failures = {config.CIRCUIT_BREAKER_COOLDOWN}s cooldown")
+        print(f"   - Circuit breaker: {self.settings['circuit_breaker_threshold']} failures = {self.settings['circuit_breaker_cooldown']}s cooldown")
         print(f"   - Checkpoint: every {config.PHASE2_CHECKPOINT_INTERVAL} books")
+        print(f"   - HTTP cache: {self.cache.path if self.cache else 'disabled'}")
+        print(f"   - Schedule: {self.schedule}")
+        if self.time_budget:
+            print(f"   - Time budget: {utils.format_duration(self.time_budget)}")
+        print(f"   - Live controls: {self.control.control_file}")
         print()
         
         # Load checkpoint
         self.load_checkpoint()
         
-        if self.start_index >= len(self.book_ids):
+        if not self.pending_ids:
             print("✓ All books already scraped!")
             return
         
+        if self.schedule == 'density':
+            self.scheduler = id_scheduler.DensityScheduler(self.pending_ids, density_file=self.density_file)
+        else:
+            self.scheduler = id_scheduler.SequentialScheduler(self.pending_ids, density_file=self.density_file)
+        
         self.start_time = time.time()
+        deadline = self.start_time + self.time_budget if self.time_budget else None
         
-        # Scrape books sequentially (no concurrency for fragile server)
-        for index in range(self.start_index, len(self.book_ids)):
-            book_id = self.book_ids[index]
+        # Scrape books in batches of `concurrency` (1 = sequential for a fragile server)
+        completed = 0
+        total = len(self.pending_ids)
+        while self.scheduler.remaining() > 0:
+            # Apply live controls (may block while paused)
+            self.check_controls()
+            if deadline and time.time() >= deadline:
+                print(f"\n⏱️  Time budget of {utils.format_duration(self.time_budget)} used up")
+                self.control.state = crawl_control.STATE_DRAIN
+            if self.control.draining:
+                break
+            self.fetcher.ensure_pool_size(self.settings['concurrency'])
             
             # Check circuit breaker
             self.circuit_breaker_check()
+            if self.control.draining:
+                break
             
             # Extract book metadata
-            book = self.extract_book_metadata(book_id)
-            
-            if book:
-                self.books.append(book)
-            else:
-                self.failed_ids.append(book_id)
+            batch_ids = self.scheduler.next_batch(self.settings['concurrency'])
+            batch_books = self.fetch_batch(batch_ids)
             
-            # Progress tracking
-            completed = index - self.start_index + 1
-            total = len(self.book_ids) - self.start_index
-            utils.print_progress(completed, total, self.start_time, prefix="Progress")
-            
-            # Checkpoint periodically
-            if (index + 1) % config.PHASE2_CHECKPOINT_INTERVAL == 0:
-                self.save_checkpoint(index)
+            for book_id, book in zip(batch_ids, batch_books):
+                if book is INTERRUPTED:
+                    # Not recorded anywhere, so the next run picks it up again
+                    continue
+                elif book is EMPTY_PAGE:
+                    self.empty_ids.append(book_id)
+                    self.scheduler.record(book_id, id_scheduler.OUTCOME_EMPTY)
+                elif book:
+                    self.books.append(book)
+                    self.scheduler.record(book_id, id_scheduler.OUTCOME_BOOK)
+                else:
+                    self.failed_ids.append(book_id)
+                    self.scheduler.record(book_id, id_scheduler.OUTCOME_FAILED)
+                
+                # Progress tracking
+                completed += 1
+                utils.print_progress(completed, total, self.start_time, prefix="Progress")
+                
+                # Checkpoint periodically
+                if completed % config.PHASE2_CHECKPOINT_INTERVAL == 0:
+                    self.save_checkpoint()
             
             # Rate limiting (except on last book)
-            if index < len(self.book_ids) - 1:
+            if self.scheduler.remaining() > 0:
                 self.wait_with_backoff()
         
+        if self.control.draining:
+            self.save_checkpoint()
+            print(f"\n✓ Stopped after {completed} IDs ({total - completed} left) - run again to resume")
+            return
+        
+        self.scheduler.save_density()
+        
         # Save final results
-        output_file = "books_complete_test.json" if self.test_mode else config.PHASE2_OUTPUT_FILE
+        output_file = "books_complete_test.json.gz" if self.test_mode else config.PHASE2_OUTPUT_FILE
         
         result_data = {
             'total_books': len(self.books),
             'failed_books': len(self.failed_ids),
+            'empty_ids_count': len(self.empty_ids),
             'books': self.books,
             'failed_ids': self.failed_ids,
+            'empty_ids': self.empty_ids,
             'scraped_at': utils.get_timestamp()
         }
         
         utils.save_json(result_data, output_file)
+        if self.cache:
+            self.cache.close()
         
         # Print summary
         elapsed = time.time() - self.start_time
-        total_attempted = len(self.books) + len(self.failed_ids)
-        success_rate = (len(self.books) / total_attempted * 100) if total_attempted > 0 else 0
+        total_attempted = len(self.books) + len(self.empty_ids) + len(self.failed_ids)
+        success_rate = ((total_attempted - len(self.failed_ids)) / total_attempted * 100) if total_attempted > 0 else 0
         
         print(f"\n{'='*60}")
         print(f"✓ Phase 2 HTTP Complete!")
         print(f"  Total books scraped: {len(self.books)}")
+        print(f"  Empty IDs (no book): {len(self.empty_ids)}")
         print(f"  Failed books: {len(self.failed_ids)}")
         print(f"  Success rate: {success_rate:.1f}%")
         print(f"  Time elapsed: {utils.format_duration(elapsed)}")
         print(f"  Average: {elapsed/total_attempted:.1f}s per book")
         print(f"  Output saved to: {output_file}")
+        connection_stats = self.fetcher.stats()
+        print(f"  Connections: {connection_stats['new_connections']} new, "
+              f"{connection_stats['reused_connections']} reused ({connection_stats['reuse_rate']:.1f}% reuse), "
+              f"{connection_stats['recycles']} pool recycles")
+        if self.cache:
+            cache_stats = self.cache.stats()
+            print(f"  HTTP cache: {cache_stats['hit_rate']:.1f}% hits "
+                  f"({cache_stats['hits_not_modified']} not modified, {cache_stats['hits_unchanged']} unchanged, "
+                  f"{cache_stats['misses']} misses, {cache_stats['evictions']} evicted)")
         print(f"{'='*60}")
         
         # Print statistics
@@ -300,10 +498,17 @@ def main():
     parser = argparse.ArgumentParser(description='Phase 2 HTTP: Extract complete metadata from ISBN Chile (Lightweight)')
     parser.add_argument('--test', action='store_true', help='Run in test mode')
     parser.add_argument('--limit', type=int, default=10, help='Number of books for test mode')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the on-disk HTTP cache (always download and parse pages)')
+    parser.add_argument('--schedule', choices=['sequential', 'density'], default=config.PHASE2_SCHEDULE,
+                        help='ID order: sequential, or dense ID ranges first (learned as the crawl goes)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Stop (with a checkpoint) after this many hours')
     
     args = parser.parse_args()
     
-    scraper = Phase2HTTPScraper(test_mode=args.test, test_limit=args.limit)
+    time_budget = args.time_budget * 3600 if args.time_budget else None
+    scraper = Phase2HTTPScraper(test_mode=args.test, test_limit=args.limit, use_cache=not args.no_cache,
+                                schedule=args.schedule, time_budget=time_budget)
     scraper.run()
 
 
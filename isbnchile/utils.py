@@ -2,12 +2,12 @@
 Utility functions for ISBN Chile scraper
 """
 
-import json
 import os
 import time
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 import config
+from json_io import read_json_file, write_json_file
 
 
 def save_checkpoint(data, filename):
@@ -15,8 +15,7 @@ def save_checkpoint(data, filename):
     filepath = os.path.join(config.OUTPUT_DIR, filename)
     os.makedirs(config.OUTPUT_DIR, exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json_file(data, filepath)
     
     print(f"✓ Checkpoint saved: {filename}")
 
@@ -25,12 +24,10 @@ def load_checkpoint(filename):
     """Load checkpoint data from JSON file"""
     filepath = os.path.join(config.OUTPUT_DIR, filename)
     
-    if not os.path.exists(filepath):
+    data = read_json_file(filepath)
+    if data is None:
         return None
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     print(f"✓ Checkpoint loaded: {filename}")
     return data
 
@@ -40,8 +37,7 @@ def save_json(data, filename):
     filepath = os.path.join(config.OUTPUT_DIR, filename)
     os.makedirs(config.OUTPUT_DIR, exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json_file(data, filepath)
     
     print(f"✓ Data saved: {filename}")
 
@@ -49,14 +45,7 @@ def save_json(data, filename):
 def load_json(filename):
     """Load data from JSON file"""
     filepath = os.path.join(config.OUTPUT_DIR, filename)
-    
-    if not os.path.exists(filepath):
-        return None
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    return data
+    return read_json_file(filepath)
 
 
 def extract_book_id_from_url(url):
@@ -98,8 +98,8 @@ def validate_data(filename):
 
 def main():
     parser = argparse.ArgumentParser(description='Validate scraped book data')
-    parser.add_argument('filename', nargs='?', default='books_complete_test.json',
-                       help='JSON file to validate (default: books_complete_test.json)')
+    parser.add_argument('filename', nargs='?', default='books_complete_test.json.gz',
+                       help='JSON file to validate, optionally .gz/.zst compressed (default: books_complete_test.json.gz)')
     
     args = parser.parse_args()
     